@@ -1,20 +1,11 @@
 """setup.py controls the build, testing, and distribution of the egg"""
 from __future__ import print_function
 
-import re
 import os.path
 
 from setuptools import setup, find_packages
 
 
-VERSION_REGEX = re.compile(
-    r"""
-    ^__version__\s=\s
-    ['"](?P<version>.*?)['"]
-""",
-    re.MULTILINE | re.VERBOSE,
-)
-
 VERSION_FILE = os.path.join("terrawrap", "version.py")
 
 
@@ -27,12 +18,14 @@ def get_long_description():
 
 def get_version():
     """Reads the version from the package"""
+    version_namespace: dict = {}
     with open(VERSION_FILE, encoding="utf-8") as handle:
-        lines = handle.read()
-        result = VERSION_REGEX.search(lines)
-        if result:
-            return result.groupdict()["version"]
-        raise ValueError("Unable to determine __version__")
+        # pylint: disable=exec-used
+        exec(handle.read(), version_namespace)
+    try:
+        return version_namespace["__version__"]
+    except KeyError as exception:
+        raise ValueError("Unable to determine __version__") from exception
 
 
 def get_requirements():
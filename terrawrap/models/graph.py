@@ -1,10 +1,10 @@
 """Module containing the ApplyGraph class"""
 import concurrent.futures
-from typing import List, Dict, Set
+import itertools
+from typing import Dict, Iterable, List, Set, Tuple
 
 import networkx
 
-from terrawrap.utils.graph import find_source_nodes
 from terrawrap.models.graph_entry import GraphEntry, NoOpGraphEntry, Entry
 
 
@@ -22,9 +22,15 @@ class ApplyGraph:
         """
         self.command = command
         self.graph = graph
-        self.graph_dict: Dict[str, Entry] = {}
         self.post_graph = post_graph
         self.prefix = prefix
+        # Build every entry up front so scheduling is a plain lookup. Entries that never run stay "Pending".
+        # The entries share most of their parent directories, so they share the directory listings too.
+        directory_listings: Dict[str, Tuple[str, ...]] = {}
+        self.graph_dict: Dict[str, Entry] = {}
+        for node in itertools.chain(graph, post_graph):
+            if node not in self.graph_dict:
+                self.graph_dict[node] = self._create_entry(node, directory_listings)
         self.not_applied: Set[str] = set()
         self.applied: Set[str] = set()
         self.failures: List[str] = []
@@ -38,93 +44,56 @@ class ApplyGraph:
     ):
         """
         Function for executing the graph. Will execute in parallel, up to the limit given in num_parallel.
+        An entry is submitted as soon as all of its predecessors have been applied successfully, so a slow
+        entry only holds up the entries that depend on it.
         :param num_parallel: The number of pipeline entries to run in parallel.
         :param debug: True if Terraform debugging should be turned on.
         :param print_only_changes: True if only directories which contained changes should be printed.
         """
-        sources = find_source_nodes(self.graph)
-        futures_to_paths = {}
+        # Number of predecessors of each node that still have to finish successfully before it can run
+        pending_predecessors: Dict[str, int] = dict(self.graph.in_degree())
+        # Ready entries are kept on a stack and handed to the pool only when a worker is free, so entries
+        # released by the most recent completion run first and a dependency chain finishes sooner
+        ready = [node for node, count in pending_predecessors.items() if not count]
+        ready.reverse()
+        futures_to_paths: Dict[concurrent.futures.Future, str] = {}
 
         with concurrent.futures.ThreadPoolExecutor(
             max_workers=num_parallel
         ) as executor:
-            for source in sources:
-                entry = self._get_or_create_entry(source)
-
-                future = executor.submit(entry.execute, self.command, debug=debug)
-                futures_to_paths[future] = entry.path
-
-            for future in concurrent.futures.as_completed(futures_to_paths):
-                path = futures_to_paths[future]
-                exit_code, stdout, changes_detected = future.result()
-
-                if stdout and print_only_changes and not changes_detected:
-                    stdout = ["No changes detected.\n"]
-
-                print(f"Output for {path}:\n\n{''.join(stdout).strip()}\n")
-
-                if exit_code != 0:
-                    self.failures.append(path)
-
-                successors = list(self.graph.successors(path))
-                if successors:
-                    self.recursive_executor(
-                        executor, successors, num_parallel, debug, print_only_changes
-                    )
-
-        for node in self.graph:
-            item = self.graph_dict.get(node)
-            if not item:
-                self.not_applied.add(node)
-            elif item.state == "no-op":
-                self.not_applied.add(item.path)
-            else:
-                self.applied.add(node)
-
-    def recursive_executor(
-        self,
-        executor: concurrent.futures.Executor,
-        successors: List[str],
-        num_parallel: int,
-        debug: bool,
-        print_only_changes: bool,
-    ):
-        """
-        Helper function for executing graph entries recursively
-        :param executor: The Executor to use. See concurrent.futures.Executor.
-        :param successors: A list of successors to be executed from the previous call
-        :param num_parallel: The number of pipeline entries to run in parallel.
-        :param debug: True if Terraform debugging should be turned on.
-        :param print_only_changes: True if only directories which contained changes should be printed.
-        """
-        futures_to_paths = {}
 
-        for node in successors:
-            entry = self._get_or_create_entry(node)
-            if entry.state != "Pending":
-                continue
-            if not self._can_be_applied(entry):
-                continue
+            def submit_ready():
+                while ready and len(futures_to_paths) < num_parallel:
+                    entry = self.graph_dict[ready.pop()]
+                    future = executor.submit(entry.execute, self.command, debug=debug)
+                    futures_to_paths[future] = entry.path
 
-            future = executor.submit(entry.execute, self.command, debug=debug)
-            futures_to_paths[future] = entry.path
-
-        for future in concurrent.futures.as_completed(futures_to_paths):
-            path = futures_to_paths[future]
-            exit_code, stdout, changes_detected = future.result()
+            submit_ready()
+            while futures_to_paths:
+                done, _ = concurrent.futures.wait(
+                    futures_to_paths, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    path = futures_to_paths.pop(future)
+                    exit_code, stdout, changes_detected = future.result()
 
-            if stdout and print_only_changes and not changes_detected:
-                stdout = ["No changes detected.\n"]
+                    if exit_code != 0:
+                        # Successors of a failed entry are never released, so they will not be applied
+                        self.failures.append(path)
+                    else:
+                        for successor in self.graph.successors(path):
+                            pending_predecessors[successor] -= 1
+                            if not pending_predecessors[successor]:
+                                ready.append(successor)
+                    # Start the next entries before printing so they run while the output is written
+                    submit_ready()
+
+                    if stdout and print_only_changes and not changes_detected:
+                        stdout = ["No changes detected.\n"]
 
-            print(f"Output for {path}:\n\n{''.join(stdout).strip()}\n")
-            if exit_code != 0:
-                self.failures.append(path)
+                    print(f"Output for {path}:\n\n{''.join(stdout).strip()}\n")
 
-            next_successors = list(self.graph.successors(path))
-            if next_successors:
-                self.recursive_executor(
-                    executor, next_successors, num_parallel, debug, print_only_changes
-                )
+        self._record_applied(self.graph)
 
     def execute_post_graph(
         self,
@@ -144,7 +113,7 @@ class ApplyGraph:
             max_workers=num_parallel
         ) as executor:
             for node in self.post_graph:
-                entry = self._get_or_create_entry(node)
+                entry = self.graph_dict[node]
 
                 future = executor.submit(entry.execute, self.command, debug=debug)
                 futures_to_paths[future] = entry.path
@@ -162,51 +131,31 @@ class ApplyGraph:
                     if exit_code != 0:
                         self.failures.append(path)
 
-        for node in self.post_graph:
-            item = self.graph_dict.get(node)
-            if not item:
-                self.not_applied.add(node)
-            elif item.state == "no-op":
-                self.not_applied.add(item.path)
-            else:
-                self.applied.add(node)
+        self._record_applied(self.post_graph)
 
-    def _can_be_applied(self, entry: GraphEntry):
+    def _record_applied(self, nodes: Iterable[str]):
         """
-        Checks if an entry can be applied.
-        :param entry: The entry to be tested.
-        :return: A boolean False if the entry cannot be applied otherwise True.
+        Sorts the given nodes into applied and not applied, based on the entries that were executed.
+        :param nodes: The nodes that were scheduled to be executed.
         """
-        if entry:
-            path = entry.path
-            predecessors = list(self.graph.predecessors(path))
-
-            for predecessor in predecessors:
-                pred_entry = self.graph_dict.get(predecessor)
-
-                if pred_entry:
-                    if pred_entry.state not in ("Success", "no-op"):
-                        return False
-                else:
-                    return False
-
-        else:
-            return False
-
-        return True
-
-    def _get_or_create_entry(self, node: str):
+        scheduled = set(nodes)
+        applied = scheduled.intersection(
+            path
+            for path, entry in self.graph_dict.items()
+            if entry.state not in ("no-op", "Pending")
+        )
+        self.applied |= applied
+        self.not_applied |= scheduled - applied
+
+    def _create_entry(
+        self, node: str, directory_listings: Dict[str, Tuple[str, ...]]
+    ) -> Entry:
         """
-        Gets an entry from the graph dictionary or create it if it does not exist
-        :param node: The node used to fetch the graph entry
+        Creates the graph entry for a node. Nodes outside of the prefix are not applied.
+        :param node: The node to create the graph entry for
+        :param directory_listings: Directory listings shared between the graph entries
         :return: The graph entry
         """
-        if self.graph_dict.get(node):
-            entry = self.graph_dict.get(node)
-        else:
-            if node.startswith(self.prefix):
-                entry = GraphEntry(node, [])
-            else:
-                entry = NoOpGraphEntry(node, [])
-            self.graph_dict[node] = entry
-        return entry
+        if node.startswith(self.prefix):
+            return GraphEntry(node, [], directory_listings)
+        return NoOpGraphEntry(node, [])
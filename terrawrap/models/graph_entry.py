@@ -2,12 +2,12 @@
 from abc import ABC, abstractmethod
 
 import os
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from terrawrap.utils.cli import execute_command
 from terrawrap.utils.config import (
     find_wrapper_config_files,
-    parse_wrapper_configs,
+    parse_wrapper_configs_cached,
     resolve_envvars,
 )
 from terrawrap.utils.path import get_absolute_path
@@ -45,16 +45,27 @@ class NoOpGraphEntry(Entry):
 class GraphEntry(Entry):
     """Class representing a Graph Entry"""
 
-    def __init__(self, path: str, variables: List[str]):
+    def __init__(
+        self,
+        path: str,
+        variables: List[str],
+        directory_listings: Optional[Dict[str, Tuple[str, ...]]] = None,
+    ):
         """
         :param path: The path to the Terraform configuration files to execute.
         :param variables: Any additional variables to set alongside the Terraform command.
+        :param directory_listings: Optional directory listings to share with other entries while finding the
+        wrapper config files, see find_wrapper_config_files.
         """
         self.path = path
         self.abs_path = get_absolute_path(path=path)
-        wrapper_config_files = find_wrapper_config_files(self.abs_path)
-        self.wrapper_config = parse_wrapper_configs(wrapper_config_files)
+        wrapper_config_files = find_wrapper_config_files(
+            self.abs_path, directory_listings
+        )
+        self.wrapper_config = parse_wrapper_configs_cached(tuple(wrapper_config_files))
         self.envvars = resolve_envvars(self.wrapper_config.envvars)
+        # The environment doesn't change between runs, so merge it once instead of on every execute
+        self._command_env = {**os.environ, **self.envvars}
         self.variables = variables
         self.state = "Pending"
 
@@ -70,11 +81,9 @@ class GraphEntry(Entry):
         """
         print(f"Executing {self.abs_path} {operation} ...")
         self.state = "Executing"
-        command_env = os.environ.copy()
-        command_env.update(self.envvars)
-
+        command_env = self._command_env
         if debug:
-            command_env["TF_LOG"] = "DEBUG"
+            command_env = {**command_env, "TF_LOG": "DEBUG"}
 
         # We're using --no-resolve-envvars here because we've already resolved the environment variables in
         # the constructor. We are then passing in those environment variables explicitly in the
@@ -94,17 +103,14 @@ class GraphEntry(Entry):
             self.state = "Failed"
             return init_exit_code, init_stdout, True
 
-        shell = False
         if operation in ["apply", "destroy"]:
-            operation_args = ["yes", "yes", "|"] + operation_args
-            shell = True
+            operation_args += ["-auto-approve"]
 
         operation_exit_code, operation_stdout = execute_command(
-            " ".join(operation_args) if shell else operation_args,
+            operation_args,
             print_output=False,
             capture_stderr=True,
             env=command_env,
-            shell=shell,
             cwd=self.path,
         )
 
@@ -113,16 +119,21 @@ class GraphEntry(Entry):
         else:
             self.state = "Failed"
 
+        # Terraform prints the resource summary near the end of its output, so search backwards
         changes_detected = True
         if any(
             "Resources: 0 added, 0 changed, 0 destroyed" in line
-            for line in operation_stdout
+            for line in reversed(operation_stdout)
         ):
             changes_detected = False
 
         print(f"\nFinished executing {self.abs_path} {operation} ...")
+        # Terraform output can be large, so append to the init output instead of copying both into a new list
+        output = init_stdout
+        output.append("\n")
+        output.extend(operation_stdout)
         return (
             operation_exit_code,
-            init_stdout + ["\n"] + operation_stdout,
+            output,
             changes_detected,
         )
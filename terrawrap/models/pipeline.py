@@ -1,9 +1,9 @@
 """Module containing the Pipeline class"""
 import concurrent.futures
 import csv
+import os
 from collections import defaultdict
-from pathlib import Path
-from typing import Iterable, Optional, List, DefaultDict
+from typing import Dict, Iterable, Optional, List, DefaultDict, Tuple
 
 from terrawrap.models.pipeline_entry import PipelineEntry
 
@@ -11,6 +11,7 @@ from terrawrap.models.pipeline_entry import PipelineEntry
 class Pipeline:
     """Class for representing a pipeline."""
 
+    # pylint: disable=too-many-locals
     def __init__(self, command: str, pipeline_path: str):
         """
         :param command: The Terraform command that this pipeline should execute.
@@ -27,24 +28,56 @@ class Pipeline:
             )
 
         with open(pipeline_path, encoding="utf-8") as pipeline_file:
-            reader = csv.DictReader(pipeline_file)
-            # Lambda function is needed here because the argument to defaultdict needs to be a function that
-            # returns an object.
-            entries: DefaultDict[
-                int, DefaultDict[str, List[PipelineEntry]]
-            ] = defaultdict(lambda: defaultdict(list))
-
+            reader = csv.reader(pipeline_file)
+            # Look the columns up once from the header instead of building a dict for every row.
+            # An empty file has no header and is an empty pipeline, like it was with DictReader.
+            columns = {name: index for index, name in enumerate(next(reader, []))}
+            rows = []
             for row in reader:
-                entry = PipelineEntry(
-                    path=row["directory"],
-                    variables=row["variables"].split(" ") if row["variables"] else [],
-                )
-                seq = int(row["seq"])
-                path = Path(row["directory"])
-                if not path.is_symlink():
-                    entries[seq]["parallel"].append(entry)
-                else:
-                    entries[seq]["sequential"].append(entry)
+                # DictReader skipped blank lines for us, so keep doing that
+                if not row:
+                    continue
+                # DictReader filled in missing trailing fields, so the variables field can be left off a row
+                row += [""] * (len(columns) - len(row))
+                seq_field = row[columns["seq"]]
+                directory = row[columns["directory"]]
+                # An empty directory would run in the current directory, so fail loudly instead
+                if not seq_field or not directory:
+                    raise RuntimeError(
+                        f"Pipeline '{pipeline_path}' line {reader.line_num} is missing its seq or directory"
+                    )
+                rows.append((int(seq_field), directory, row[columns["variables"]]))
+
+        # Creating an entry walks up the directory tree to find and read its wrapper configs, which is mostly
+        # waiting on I/O, so create them in parallel. map() keeps the results in the same order as the rows.
+        # The entries share most of their parent directories, so they share the directory listings too.
+        directory_listings: Dict[str, Tuple[str, ...]] = {}
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            pipeline_entries = executor.map(
+                lambda row: PipelineEntry(
+                    path=row[1],
+                    variables=row[2].split(" ") if row[2] else [],
+                    directory_listings=directory_listings,
+                ),
+                rows,
+            )
+
+        # Lambda function is needed here because the argument to defaultdict needs to be a function that
+        # returns an object.
+        entries: DefaultDict[int, DefaultDict[str, List[PipelineEntry]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        # The same directory is often listed in several sequences, so only stat each one once
+        is_symlink: Dict[str, bool] = {}
+
+        for (seq, directory, _), entry in zip(rows, pipeline_entries):
+            if directory not in is_symlink:
+                # islink() follows a symlink named with a trailing slash, so strip it first
+                is_symlink[directory] = os.path.islink(directory.rstrip(os.sep))
+            if not is_symlink[directory]:
+                entries[seq]["parallel"].append(entry)
+            else:
+                entries[seq]["sequential"].append(entry)
 
         self.entries = entries
 
@@ -61,20 +94,23 @@ class Pipeline:
         :param debug: True if Terraform debugging should be turned on.
         :param print_only_changes: True if only directories which contained changes should be printed.
         """
-        for sequence in sorted(self.entries.keys(), reverse=self.reverse_pipeline):
-            print(f"Executing sequence {sequence}")
-            with concurrent.futures.ThreadPoolExecutor(
-                max_workers=num_parallel
-            ) as executor:
+        # The pools are shared by all sequences. _execute_entries waits for every entry it submits, so each
+        # sequence still finishes before the next one starts.
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=num_parallel
+        ) as parallel_executor, concurrent.futures.ThreadPoolExecutor(
+            max_workers=1
+        ) as sequential_executor:
+            for sequence in sorted(self.entries.keys(), reverse=self.reverse_pipeline):
+                print(f"Executing sequence {sequence}")
                 self._execute_entries(
                     command=self.command,
                     entries=self.entries[sequence]["parallel"],
                     debug=debug,
-                    executor=executor,
+                    executor=parallel_executor,
                     print_only_changes=print_only_changes,
                 )
 
-            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
                 for entry in self.entries[sequence]["sequential"]:
                     # It's very important that these sequential entries run init and then plan, and not all
                     # the inits and then all the plans, because the symlink directories might share the same
@@ -84,7 +120,7 @@ class Pipeline:
                         command=self.command,
                         entries=[entry],
                         debug=debug,
-                        executor=executor,
+                        executor=sequential_executor,
                         print_only_changes=print_only_changes,
                     )
 
@@ -108,13 +144,15 @@ class Pipeline:
         :param print_only_changes: True if only directories which contained changes should be printed.
         """
         command = command or self.command
-        futures_to_paths = {}
         failures = []
 
+        entries = list(entries)
         for entry in entries:
             print(f"Executing {entry.path} {command} ...")
-            future = executor.submit(entry.execute, command, debug=debug)
-            futures_to_paths[future] = entry.path
+        futures_to_paths = {
+            executor.submit(entry.execute, command, debug=debug): entry.path
+            for entry in entries
+        }
 
         for future in concurrent.futures.as_completed(futures_to_paths):
             exit_code, stdout, changes_detected = future.result()
@@ -123,8 +161,11 @@ class Pipeline:
             if print_only_changes and not changes_detected:
                 stdout = ["No changes detected.\n"]
 
-            print(f"\nFinished executing {path} {command} ...")
-            print(f"Output:\n\n{''.join(stdout).strip()}\n")
+            # Print the whole block at once so it's written in one go
+            print(
+                f"\nFinished executing {path} {command} ...\n"
+                f"Output:\n\n{''.join(stdout).strip()}\n"
+            )
 
             if exit_code != 0:
                 failures.append(path)
@@ -2,12 +2,13 @@
 import logging
 import os
 import tempfile
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from terrawrap.utils.cli import execute_command
 from terrawrap.utils.config import (
     find_wrapper_config_files,
-    parse_wrapper_configs,
+    parse_wrapper_configs_cached,
+    register_ssm_envvars,
     resolve_envvars,
 )
 from terrawrap.utils.path import get_absolute_path
@@ -18,18 +19,39 @@ logger = logging.getLogger(__name__)
 class PipelineEntry:
     """Class representing a Pipeline Entry"""
 
-    def __init__(self, path: str, variables: List[str]):
+    def __init__(
+        self,
+        path: str,
+        variables: List[str],
+        directory_listings: Optional[Dict[str, Tuple[str, ...]]] = None,
+    ):
         """
         :param path: The path to the Terraform configuration files to execute.
         :param variables: Any additional variables to set alongside the Terraform command.
+        :param directory_listings: Optional directory listings to share with other entries while finding the
+        wrapper config files, see find_wrapper_config_files.
         """
         self.path = get_absolute_path(path=path)
-        wrapper_config_files = find_wrapper_config_files(self.path)
-        wrapper_config = parse_wrapper_configs(wrapper_config_files)
-        self.envvars = resolve_envvars(wrapper_config.envvars)
+        wrapper_config_files = find_wrapper_config_files(self.path, directory_listings)
+        wrapper_config = parse_wrapper_configs_cached(tuple(wrapper_config_files))
+        self._envvar_configs = wrapper_config.envvars
+        # Registering now means the first entry to execute fetches the SSM parameters for the whole pipeline
+        register_ssm_envvars(self._envvar_configs)
+        self._envvars: Optional[Dict[str, str]] = None
+        self._command_env: Optional[Dict[str, str]] = None
         self.variables = variables
 
-    # pylint: disable=too-many-locals
+    @property
+    def envvars(self) -> Dict[str, str]:
+        """
+        The environment variables from the wrapper config. They're resolved the first time they're needed,
+        so entries that never execute don't look anything up in SSM.
+        """
+        if self._envvars is None:
+            self._envvars = resolve_envvars(self._envvar_configs)
+        return self._envvars
+
+    # pylint: disable=too-many-locals,too-many-branches
     def execute(
         self, operation: str, debug: bool = False
     ) -> Tuple[int, List[str], bool]:
@@ -39,85 +61,103 @@ class PipelineEntry:
         :param debug: True if Terraform debug info should be printed.
         :return: A tuple of the exit code, output of the command, and whether changes were detected.
         """
-        command_env = os.environ.copy()
-        command_env.update(self.envvars)
-
-        if debug:
-            command_env["TF_LOG"] = "DEBUG"
-
-        # pylint: disable=unused-variable
-        plan_file, plan_file_name = tempfile.mkstemp(suffix=".tfplan")
-
-        # We're using --no-resolve-envvars here because we've already resolved the environment variables in
-        # the constructor. We are then passing in those environment variables explicitly in the
-        # execute_command call below.
-        base_args = ["tf", "--no-resolve-envvars", self.path]
-        init_args = base_args + ["init"] + self.variables
-        plan_args = (
-            base_args
-            + ["plan", "-detailed-exitcode", f"-out={plan_file_name}"]
-            + self.variables
-        )
-        operation_args = base_args + [operation] + self.variables
-
-        if operation in ["apply", "destroy"]:
-            operation_args += ["-auto-approve"]
-
-        init_exit_code, output = execute_command(
-            init_args,
-            print_output=False,
-            capture_stderr=True,
-            env=command_env,
-            cwd=self.path,
+        # Build the command environment on the first execute and reuse it for later operations on this entry
+        if self._command_env is None:
+            # Resolving can fail, e.g. on an SSM error, so report it as a failure of this entry
+            try:
+                self._command_env = {**os.environ, **self.envvars}
+            except Exception as exception:  # pylint: disable=broad-except
+                return (
+                    1,
+                    [f"Failed to resolve environment variables: {exception}\n"],
+                    True,
+                )
+        command_env = (
+            {**self._command_env, "TF_LOG": "DEBUG"} if debug else self._command_env
         )
 
-        if init_exit_code != 0:
-            return init_exit_code, output, True
-
-        # We need to plan first before we apply so we can actually see a plan... Thanks Hashicorp
-        if operation in ["apply"]:
-            plan_exit_code, plan_stdout = execute_command(
-                plan_args,
+        # Only apply needs a plan file, so it's created right before planning
+        plan_file_name: Optional[str] = None
+        try:
+            # We're using --no-resolve-envvars here because we've already resolved the environment variables
+            # for this entry. We are then passing in those environment variables explicitly in the
+            # execute_command call below.
+            base_args = ["tf", "--no-resolve-envvars", self.path]
+            init_args = base_args + ["init"] + self.variables
+            operation_args = base_args + [operation] + self.variables
+
+            if operation in ["apply", "destroy"]:
+                operation_args += ["-auto-approve"]
+
+            init_exit_code, output = execute_command(
+                init_args,
                 print_output=False,
                 capture_stderr=True,
                 env=command_env,
                 cwd=self.path,
             )
 
-            output += ["\n"] + plan_stdout
-
-            if plan_exit_code != 2:
-                return (
-                    plan_exit_code,
-                    output,
-                    False,
+            if init_exit_code != 0:
+                return init_exit_code, output, True
+
+            # We need to plan first before we apply so we can actually see a plan... Thanks Hashicorp
+            if operation in ["apply"]:
+                # Terraform only needs the file name, so don't hold the descriptor open while it runs
+                plan_file, plan_file_name = tempfile.mkstemp(suffix=".tfplan")
+                os.close(plan_file)
+                plan_args = (
+                    base_args
+                    + ["plan", "-detailed-exitcode", f"-out={plan_file_name}"]
+                    + self.variables
+                )
+                plan_exit_code, plan_stdout = execute_command(
+                    plan_args,
+                    print_output=False,
+                    capture_stderr=True,
+                    env=command_env,
+                    cwd=self.path,
                 )
 
-            operation_args += [plan_file_name]
+                # Append in place rather than building a new list out of the already large output
+                output.append("\n")
+                output.extend(plan_stdout)
 
-        if operation in ["plan"]:
-            operation_args += ["--detailed-exitcode"]
+                if plan_exit_code != 2:
+                    return (
+                        plan_exit_code,
+                        output,
+                        False,
+                    )
 
-        operation_exit_code, operation_stdout = execute_command(
-            operation_args,
-            print_output=False,
-            capture_stderr=True,
-            env=command_env,
-            cwd=self.path,
-        )
+                operation_args += [plan_file_name]
 
-        output += ["\n"] + operation_stdout
+            if operation in ["plan"]:
+                operation_args += ["--detailed-exitcode"]
 
-        changes_detected = True
-        if operation in ["plan"]:
-            if operation_exit_code == 2:
-                # Set exit code to 0 so the command doesn't fail out
-                operation_exit_code = 0
-            elif operation_exit_code != 2:
-                changes_detected = False
+            operation_exit_code, operation_stdout = execute_command(
+                operation_args,
+                print_output=False,
+                capture_stderr=True,
+                env=command_env,
+                cwd=self.path,
+            )
 
-        return (
-            operation_exit_code,
-            output,
-            changes_detected,
-        )
+            output.append("\n")
+            output.extend(operation_stdout)
+
+            changes_detected = True
+            if operation in ["plan"]:
+                if operation_exit_code == 2:
+                    # Set exit code to 0 so the command doesn't fail out
+                    operation_exit_code = 0
+                elif operation_exit_code != 2:
+                    changes_detected = False
+
+            return (
+                operation_exit_code,
+                output,
+                changes_detected,
+            )
+        finally:
+            if plan_file_name:
+                os.unlink(plan_file_name)
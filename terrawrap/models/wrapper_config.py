@@ -1,7 +1,7 @@
 """Data classes to represent the wrapper config file"""
-# TODO: convert these classes to dataclasses once we drop support for Python3.6
 # pylint: disable=missing-docstring
 
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, Optional, List
 
@@ -14,56 +14,46 @@ class EnvVarSource(Enum):
     UNSET = "unset"
 
 
+@dataclass
 class AbstractEnvVarConfig:
-    def __init__(self, source: EnvVarSource):
-        self.source = source
+    source: EnvVarSource
 
 
+@dataclass
 class SSMEnvVarConfig(AbstractEnvVarConfig):
-    def __init__(self, path: str):
-        super().__init__(EnvVarSource.SSM)
-        self.path = path
+    source: EnvVarSource = field(default=EnvVarSource.SSM, init=False)
+    path: str
 
 
+@dataclass
 class TextEnvVarConfig(AbstractEnvVarConfig):
-    def __init__(self, value: str):
-        super().__init__(EnvVarSource.TEXT)
-        self.value = value
+    source: EnvVarSource = field(default=EnvVarSource.TEXT, init=False)
+    value: str
 
 
+@dataclass
 class UnsetEnvVarConfig(AbstractEnvVarConfig):
-    def __init__(self):
-        super().__init__(EnvVarSource.UNSET)
+    source: EnvVarSource = field(default=EnvVarSource.UNSET, init=False)
 
 
+@dataclass
 class S3BackendConfig:
-    def __init__(
-        self,
-        bucket: str = None,
-        region: str = None,
-        dynamodb_table: str = None,
-        role_arn: str = None,
-    ):
-        self.region = region
-        self.bucket = bucket
-        self.dynamodb_table = dynamodb_table
-        self.role_arn = role_arn
+    bucket: Optional[str] = None
+    region: Optional[str] = None
+    dynamodb_table: Optional[str] = None
+    role_arn: Optional[str] = None
 
 
+@dataclass
 class GCSBackendConfig:
-    def __init__(self, bucket: str = None):
-        self.bucket = bucket
+    bucket: Optional[str] = None
 
 
+@dataclass
 class BackendsConfig:
     # pylint: disable=invalid-name
-    def __init__(
-        self,
-        s3: Optional[S3BackendConfig] = None,
-        gcs: Optional[GCSBackendConfig] = None,
-    ):
-        self.s3 = s3
-        self.gcs = gcs
+    s3: Optional[S3BackendConfig] = None
+    gcs: Optional[GCSBackendConfig] = None
 
 
 # pylint: disable=unused-argument
@@ -82,30 +72,17 @@ def env_var_deserializer(obj_dict, cls, **kwargs):
 jsons.set_deserializer(env_var_deserializer, AbstractEnvVarConfig)
 
 
-# pylint: disable=too-many-arguments
+# pylint: disable=too-many-instance-attributes
+@dataclass
 class WrapperConfig:
-    def __init__(
-        self,
-        configure_backend: bool = True,
-        pipeline_check: bool = True,
-        backend_check: bool = True,
-        plan_check: bool = True,
-        envvars: Dict[str, AbstractEnvVarConfig] = None,
-        backends: BackendsConfig = None,
-        depends_on: List[str] = None,
-        config: bool = True,
-        audit_api_url: str = None,
-        apply_automatically: bool = True,
-        plugins: Dict[str, str] = None,
-    ):
-        self.configure_backend = configure_backend
-        self.pipeline_check = pipeline_check
-        self.backend_check = backend_check
-        self.plan_check = plan_check
-        self.envvars = envvars or {}
-        self.backends = backends
-        self.depends_on = depends_on
-        self.config = config
-        self.audit_api_url = audit_api_url
-        self.apply_automatically = apply_automatically
-        self.plugins = plugins or {}
+    configure_backend: bool = True
+    pipeline_check: bool = True
+    backend_check: bool = True
+    plan_check: bool = True
+    envvars: Dict[str, AbstractEnvVarConfig] = field(default_factory=dict)
+    backends: Optional[BackendsConfig] = None
+    depends_on: Optional[List[str]] = None
+    config: bool = True
+    audit_api_url: Optional[str] = None
+    apply_automatically: bool = True
+    plugins: Dict[str, str] = field(default_factory=dict)
@@ -1,11 +1,16 @@
 """Module for containing CLI convenience functions"""
 from __future__ import print_function
 
+import codecs
+import concurrent.futures
+import io
 import logging
+import os
+import re
 import subprocess
-import tempfile
 import time
 from enum import Enum
+from functools import lru_cache
 
 from typing import List, Tuple, Union
 
@@ -19,6 +24,7 @@ from terrawrap.utils.git_utils import get_git_root, get_git_hash
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 5
+READ_SIZE = 65536
 RETRIABLE_ERRORS = [
     "RequestError: send request failed",
     "unexpected EOF",
@@ -38,8 +44,20 @@ RETRIABLE_ERRORS = [
     "TooManyUpdates",
     "409 Conflict",
 ]
+# Search for all the retriable errors in a single pass over each line
+RETRIABLE_ERRORS_RE = re.compile(
+    "|".join(re.escape(error) for error in RETRIABLE_ERRORS)
+)
+# How many lines at the end of a failed command's output to search for retriable errors
+RETRIABLE_ERRORS_TAIL_LINES = 500
 AUDIT_POST_PATH = "/audit_info"
 AUDIT_UPDATE_PATH = "/update_audit_info"
+# Audit info is posted in the background so the command doesn't wait on the audit API. A single worker keeps
+# the posts in order, so the 'in progress' entry is always created before it's updated. Pending posts are
+# still sent before the interpreter exits.
+AUDIT_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="audit"
+)
 
 
 class Status(str, Enum):
@@ -74,8 +92,6 @@ def execute_command(
     :param kwargs: Any additional keyword arguments to Popen.
     :return: A tuple of the exit code and output of the command.
     """
-    try_count = 0
-
     # It's possible for an envvar to be set to none, so exclude those envvars.
     if "env" in kwargs:
         kwargs["env"] = {
@@ -87,11 +103,12 @@ def execute_command(
 
     if audit_api_url and kwargs["cwd"] and ("apply" in args or "destroy" in args):
         # Call _post_audit_info for working directory, setting status to 'in progress'
-        _post_audit_info(
+        AUDIT_EXECUTOR.submit(
+            _post_audit_info,
             audit_api_url=audit_api_url,
             path=kwargs["cwd"],
             start_time=start_time,
-        )
+        ).add_done_callback(_log_audit_failure)
     else:
         logger.info("No audit_api_url provided")
 
@@ -99,7 +116,7 @@ def execute_command(
     time_passed = 0
     exit_code = 0
     stdout: List[str] = []
-    while try_count < MAX_RETRIES if retry else 1:
+    for try_count in range(1, (MAX_RETRIES if retry else 1) + 1):
         exit_code, stdout = _execute_command(
             args,
             print_output,
@@ -109,10 +126,13 @@ def execute_command(
             **kwargs,
         )
 
-        try_count += 1
-
-        network_errors = _get_retriable_errors(stdout)
-        if exit_code != 0 and network_errors and retry:
+        # Only failed commands can be retried, and terraform prints the errors that failed it at the end
+        network_errors = (
+            _get_retriable_errors(stdout[-RETRIABLE_ERRORS_TAIL_LINES:])
+            if exit_code != 0 and retry
+            else []
+        )
+        if network_errors:
             logger.warning(
                 "Found network errors while running %s command: %s",
                 args,
@@ -122,21 +142,24 @@ def execute_command(
             # The command either succeeded or failed with a non network error. don't retry
             break
 
-        if time_passed >= timeout:
+        # Only back off if the command is going to be tried again
+        if try_count == MAX_RETRIES or time_passed >= timeout:
             break
 
         time_passed = jitter.backoff()
 
     if audit_api_url and kwargs["cwd"] and ("apply" in args or "destroy" in args):
-        # Call _post_audit_info again, this time to update the 'in progress' entry with new status and output
-        _post_audit_info(
+        # Call _post_audit_info again, this time to update the 'in progress' entry with new status and output.
+        # The caller gets the same output list back, so post a copy in case they change it.
+        AUDIT_EXECUTOR.submit(
+            _post_audit_info,
             audit_api_url=audit_api_url,
             path=kwargs["cwd"],
             exit_code=exit_code,
-            stdout=stdout,
+            stdout=list(stdout),
             start_time=start_time,
             update=True,
-        )
+        ).add_done_callback(_log_audit_failure)
     else:
         logger.info("No audit_api_url provided")
 
@@ -164,42 +187,69 @@ def _execute_command(
     :param kwargs: Any additional keyword arguments to Popen.
     :return: A tuple of the exit code and output of the command.
     """
-    stdout_write, stdout_path = tempfile.mkstemp()
-    with open(stdout_path, "rb") as stdout_read, open(
-        "/dev/null", "w", encoding="utf-8"
-    ) as dev_null:
-        if print_command:
-            print(f"Executing: {' '.join(args)}")
+    if print_command:
+        print(f"Executing: {' '.join(args)}")
 
-        kwargs["stdout"] = stdout_write
-        kwargs["stderr"] = stdout_write if capture_stderr else dev_null
+    kwargs["stdout"] = subprocess.PIPE
+    kwargs["stderr"] = subprocess.STDOUT if capture_stderr else subprocess.DEVNULL
 
-        # pylint: disable=consider-using-with
-        process = subprocess.Popen(args, *pargs, **kwargs)
+    # pylint: disable=consider-using-with
+    process = subprocess.Popen(args, *pargs, **kwargs)
 
+    # Read the pipe in blocks until the command closes it. The incremental decoder holds on to multi-byte
+    # characters that are split across two reads.
+    output = bytearray()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    stdout_fd = process.stdout.fileno()  # type: ignore
+    try:
         while True:
-            output = stdout_read.read(1).decode(errors="replace")
-
-            if output == "" and process.poll() is not None:
+            chunk = os.read(stdout_fd, READ_SIZE)
+            if not chunk:
                 break
 
-            if print_output and output:
-                print(output, end="", flush=True)
+            output.extend(chunk)
+            if print_output:
+                print(decoder.decode(chunk), end="", flush=True)
+
+        # Flush a character that was cut off at the end of the output
+        if print_output:
+            print(decoder.decode(b"", final=True), end="", flush=True)
+    finally:
+        process.stdout.close()  # type: ignore
 
-        exit_code = process.poll()
+    exit_code = process.wait()
 
-        stdout_read.seek(0)
-        stdout = [line.decode(errors="replace") for line in stdout_read.readlines()]
+    # Split on newlines only, the same way reading the lines from a file would
+    stdout = io.StringIO(output.decode(errors="replace")).readlines()
 
-        # ignoring mypy error below because it thinks exit_code can sometimes be None
-        # we know that will never be the case because the above While loop will keep looping forever
-        # until exit_code is not None
-        return exit_code, stdout  # type: ignore
+    return exit_code, stdout
 
 
 def _get_retriable_errors(out: List[str]) -> List[str]:
     """Filter line output for retriable errors"""
-    return [line for line in out if any(error in line for error in RETRIABLE_ERRORS)]
+    return [line for line in out if RETRIABLE_ERRORS_RE.search(line)]
+
+
+@lru_cache(maxsize=None)
+def _get_audit_session() -> requests.Session:
+    """
+    Get the session used to post to the audit API. It's shared so connections to the API are reused, and so
+    AWS credentials are only looked up once. The auth refreshes the credentials itself when they expire.
+    """
+    session = requests.Session()
+    session.auth = BotoAWSRequestsAuth(
+        aws_host="terraform-audit-api.devops.amplify.com",
+        aws_region="us-west-2",
+        aws_service="execute-api",
+    )
+    return session
+
+
+def _log_audit_failure(future: concurrent.futures.Future):
+    """Log the error if posting audit info in the background failed, since nothing waits on the result"""
+    exception = future.exception()
+    if exception:
+        logger.error("Unable to post audit info: %s", exception, exc_info=exception)
 
 
 def _post_audit_info(
@@ -229,18 +279,11 @@ def _post_audit_info(
         else (audit_api_url + AUDIT_POST_PATH)
     )
 
-    auth = BotoAWSRequestsAuth(
-        aws_host="terraform-audit-api.devops.amplify.com",
-        aws_region="us-west-2",
-        aws_service="execute-api",
-    )
-
     stdout_str = "".join(stdout) if stdout else ""
 
     try:
-        requests.post(
+        _get_audit_session().post(
             url=url,
-            auth=auth,
             json={
                 "directory": path,
                 "start_time": start_time,
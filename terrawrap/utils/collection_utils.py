@@ -1,5 +1,5 @@
 """Utilities for working with collections"""
-from typing import Dict
+from typing import Dict, List, Tuple
 
 
 def update(dict1: Dict, dict2: Dict) -> Dict:
@@ -10,13 +10,18 @@ def update(dict1: Dict, dict2: Dict) -> Dict:
     :param dict2: The dictionary to merge.
     :return: A merged dictionary.
     """
-    for key, value in dict2.items():
-        if isinstance(value, dict):
-            dict1[key] = update(dict1.get(key, {}), value)
-        elif isinstance(value, list):
-            original_value = dict1.get(key, [])
-            original_value.extend(value)
-            dict1[key] = original_value
-        else:
-            dict1[key] = value
+    # Merge child dictionaries from a stack of (target, source) pairs instead of recursing
+    stack: List[Tuple[Dict, Dict]] = [(dict1, dict2)]
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            if isinstance(value, dict):
+                # Missing children are merged into a new dictionary so the source isn't shared
+                stack.append((target.setdefault(key, {}), value))
+            elif isinstance(value, list):
+                original_value = target.get(key, [])
+                original_value.extend(value)
+                target[key] = original_value
+            else:
+                target[key] = value
     return dict1
@@ -1,6 +1,8 @@
 """Holds config utilities"""
 import os
 import sys
+import threading
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 import networkx
 
@@ -10,6 +12,12 @@ import yaml
 from jsons import DeserializationError
 from ssm_cache import SSMParameterGroup
 
+# Use libyaml's loader when PyYAML was built with it, it's much faster than the pure Python one
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader  # type: ignore
+
 from terrawrap.exceptions import NotTerraformConfigDirectory, NoDependency
 from terrawrap.models.wrapper_config import (
     WrapperConfig,
@@ -24,39 +32,52 @@ from terrawrap.utils.path import get_absolute_path, calc_repo_path
 
 DEFAULT_REGION = "us-west-2"
 SSM_ENVVAR_CACHE = SSMParameterGroup(max_age=600)
+# SSMParameterGroup isn't thread safe: refreshing iterates its parameters while other lookups add to them
+SSM_ENVVAR_CACHE_LOCK = threading.Lock()
 TF_WRAP_FILE = ".tf_wrapper"
 
 
-def find_variable_files(path: str) -> List[str]:
+def find_variable_files(
+    path: str, directory_listings: Optional[Dict[str, Tuple[str, ...]]] = None
+) -> List[str]:
     """
     Convenience function for finding all Terraform variable files by walking a given path.
     :param path: The path to the Terraform configuration directory.
+    :param directory_listings: Optional dict to cache directory listings in, see _find_files_along_path.
     :return: A list of Terraform variable files that can be found by walking down that path, in order of
     discovery from the root of the path.
     """
-    variable_files = []
-
-    elements = path.split(os.path.sep)
-
-    cur_path = os.path.sep
-
-    for element in elements:
-        cur_path = os.path.join(cur_path, element)
-        for file in os.listdir(cur_path):
-            if file.endswith(".auto.tfvars"):
-                variable_files.append(os.path.join(cur_path, file))
+    return _find_files_along_path(path, ".auto.tfvars", directory_listings)
 
-    return variable_files
 
-
-def find_wrapper_config_files(path: str) -> List[str]:
+def find_wrapper_config_files(
+    path: str, directory_listings: Optional[Dict[str, Tuple[str, ...]]] = None
+) -> List[str]:
     """
     Convenience function for finding all wrapper config files by walking a given path.
     :param path: The path to the Terraform configuration directory.
+    :param directory_listings: Optional dict to cache directory listings in, see _find_files_along_path.
     :return: A list of wrapper config files that can be found by walking down that path, in order of
     discovery from the root of the path.
     """
-    wrapper_config_files = []
+    return _find_files_along_path(path, TF_WRAP_FILE, directory_listings)
+
+
+def _find_files_along_path(
+    path: str,
+    suffix: str,
+    directory_listings: Optional[Dict[str, Tuple[str, ...]]] = None,
+) -> List[str]:
+    """
+    Finds the files with the given suffix in every directory along a path.
+    :param path: The path to walk down.
+    :param suffix: The suffix the file names must end with.
+    :param directory_listings: Optional dict of directory listings to reuse and add to. Callers that look up
+    files for many config directories can share one so the common parent directories are only listed once.
+    Without it every directory is listed again, so files created since the last call are found.
+    :return: A list of the matching files, in order of discovery from the root of the path.
+    """
+    files = []
 
     elements = path.split(os.path.sep)
 
@@ -64,11 +85,27 @@ def find_wrapper_config_files(path: str) -> List[str]:
 
     for element in elements:
         cur_path = os.path.join(cur_path, element)
-        for file in os.listdir(cur_path):
-            if file.endswith(TF_WRAP_FILE):
-                wrapper_config_files.append(os.path.join(cur_path, file))
+        if directory_listings is None:
+            names = _list_directory(cur_path)
+        else:
+            if cur_path not in directory_listings:
+                directory_listings[cur_path] = _list_directory(cur_path)
+            names = directory_listings[cur_path]
+        for file in names:
+            if file.endswith(suffix):
+                files.append(os.path.join(cur_path, file))
+
+    return files
+
 
-    return wrapper_config_files
+def _list_directory(directory: str) -> Tuple[str, ...]:
+    """
+    Lists the names in a directory.
+    :param directory: The directory to list.
+    :return: The names of the entries in the directory.
+    """
+    with os.scandir(directory) as entries:
+        return tuple(entry.name for entry in entries)
 
 
 def parse_wrapper_configs(wrapper_config_files: List[str]) -> WrapperConfig:
@@ -82,7 +119,7 @@ def parse_wrapper_configs(wrapper_config_files: List[str]) -> WrapperConfig:
 
     for wrapper_config_path in wrapper_config_files:
         with open(wrapper_config_path, encoding="utf-8") as wrapper_config_file:
-            wrapper_config = yaml.safe_load(wrapper_config_file)
+            wrapper_config = yaml.load(wrapper_config_file, Loader=SafeLoader)
             if wrapper_config and isinstance(wrapper_config, dict):
                 generated_wrapper_config = update(
                     generated_wrapper_config, wrapper_config
@@ -98,17 +135,28 @@ def parse_wrapper_configs(wrapper_config_files: List[str]) -> WrapperConfig:
         raise exception
 
 
+@lru_cache(maxsize=None)
+def parse_wrapper_configs_cached(
+    wrapper_config_files: Tuple[str, ...]
+) -> WrapperConfig:
+    """
+    Memoized version of parse_wrapper_configs for callers that only read the resulting config, such as
+    pipeline and graph entries that share the same ancestor wrapper files.
+    The same WrapperConfig object is returned for the same files, so callers must not modify it.
+    :param wrapper_config_files: A tuple of file paths to wrapper config files, see parse_wrapper_configs.
+    :return: A WrapperConfig object representing the accumulated values of all the wrapper config files
+    """
+    return parse_wrapper_configs(list(wrapper_config_files))
+
+
 def is_config_directory(directory: str) -> bool:
     """
     Checks if a wrapper file directory is a config_directory
     :param directory: A wrapper files directory
     :return: A boolean True if the config section of the wrapper file is not False or doesn't exist.
     """
-    config = False
-    for file in os.listdir(directory):
-        if file.endswith(".tf"):
-            config = True
-    return config
+    with os.scandir(directory) as entries:
+        return any(entry.name.endswith(".tf") for entry in entries)
 
 
 def create_wrapper_config_obj(config_dir, wrapper_file=None):
@@ -273,6 +321,19 @@ def graph_wrapper_dependencies(
         graph_wrapper_dependencies(predecessor, config_dict, graph, visited)
 
 
+def register_ssm_envvars(envvar_configs: Dict[str, AbstractEnvVarConfig]):
+    """
+    Adds the SSM parameters used by the given envvars to the shared SSM cache without fetching them.
+    Every parameter in the cache is fetched in batches the first time any of them is resolved, so registering
+    them up front avoids a separate fetch for each one.
+    :param envvar_configs: The 'envvars' dictionary from the wrapper config.
+    """
+    with SSM_ENVVAR_CACHE_LOCK:
+        for envvar_config in envvar_configs.values():
+            if isinstance(envvar_config, SSMEnvVarConfig):
+                SSM_ENVVAR_CACHE.parameter(envvar_config.path)
+
+
 def resolve_envvars(envvar_configs: Dict[str, AbstractEnvVarConfig]) -> Dict[str, str]:
     """
     Resolves the 'envvars' section from the wrapper config to actual environment variables that can be easily
@@ -281,12 +342,23 @@ def resolve_envvars(envvar_configs: Dict[str, AbstractEnvVarConfig]) -> Dict[str
     :return: A dictionary representing the environment variables that were resolved, with the key being the
     name of the environment variable and the value being the value of the environment variable.
     """
+    with SSM_ENVVAR_CACHE_LOCK:
+        # Add every parameter to the cache before reading any of them, so the ones that aren't cached yet are
+        # fetched together in batches instead of one at a time
+        ssm_parameters = {
+            envvar_name: SSM_ENVVAR_CACHE.parameter(envvar_config.path)
+            for envvar_name, envvar_config in envvar_configs.items()
+            if isinstance(envvar_config, SSMEnvVarConfig)
+        }
+        ssm_values = {
+            envvar_name: parameter.value
+            for envvar_name, parameter in ssm_parameters.items()
+        }
+
     resolved_envvars = {}
     for envvar_name, envvar_config in envvar_configs.items():
         if isinstance(envvar_config, SSMEnvVarConfig):
-            resolved_envvars[envvar_name] = SSM_ENVVAR_CACHE.parameter(
-                envvar_config.path
-            ).value
+            resolved_envvars[envvar_name] = ssm_values[envvar_name]
         if isinstance(envvar_config, TextEnvVarConfig):
             resolved_envvars[envvar_name] = str(envvar_config.value)
         if isinstance(envvar_config, UnsetEnvVarConfig):
@@ -1,10 +1,20 @@
 """Utility functions for working with Git"""
+from functools import lru_cache
 from typing import Set
 
 import os
 from git import Repo
 
 
+@lru_cache(maxsize=8)
+def _get_repo(path: str) -> Repo:
+    """
+    Open the git repo containing the given path. Opening a repo walks up the directory tree and parses
+    its config, so repos are cached for the few paths a single run looks at.
+    """
+    return Repo(path, search_parent_directories=True)
+
+
 def get_git_changed_files(path) -> Set[str]:
     """
     Compare HEAD of the current branch with master and return list of paths that changed
@@ -35,15 +45,15 @@ def get_git_changed_files(path) -> Set[str]:
     return changed_files
 
 
+# The root of a path's repo can't change while running, and finding it runs a git subprocess
+@lru_cache(maxsize=None)
 def get_git_root(path):
     """Get the git root directory for a given path"""
-    git_repo = Repo(path, search_parent_directories=True)
-    git_root = git_repo.git.rev_parse("--show-toplevel")
+    git_root = _get_repo(path).git.rev_parse("--show-toplevel")
     return git_root
 
 
 def get_git_hash(path):
     """Get the git hash for tf apply run changes"""
-    repo = Repo(path, search_parent_directories=True)
-    sha = repo.head.object.hexsha
+    sha = _get_repo(path).head.object.hexsha
     return sha
@@ -35,14 +35,7 @@ def find_source_nodes(graph: networkx.DiGraph) -> List[str]:
     :param graph: The graph to look for source nodes in.
     :return: source_nodes -  a list of nodes (str) in the graph with no predecessors
     """
-    source_nodes = []
-    for node in graph:
-        preds = list(graph.predecessors(node))
-        if preds:
-            continue
-        source_nodes.append(node)
-
-    return source_nodes
+    return [node for node, in_degree in graph.in_degree() if not in_degree]
 
 
 def successors(
@@ -50,10 +50,14 @@ def _get_modules_for_file(directory: str, file_name: str) -> Tuple[str, Set[str]
     :param file_name: Name of file
     :return:
     """
-    modules = set()
+    modules: Set[str] = set()
     with open(directory + "/" + file_name, "r", encoding="utf-8") as file:
+        content = file.read()
+        # Parsing HCL is expensive, so skip files that can't possibly declare a module block
+        if "module" not in content:
+            return directory, modules
         try:
-            tf_info = hcl2.load(file)
+            tf_info = hcl2.loads(content)
             for module in tf_info.get("module", []):
                 for module_config in module.values():
                     modules.add(os.path.normpath(module_config["source"]))
@@ -19,8 +19,19 @@ class FileDownloadFailed(RuntimeError):
 class PluginDownload:
     """Utility for downloading plugins"""
 
-    def __init__(self, s3_client):
-        self.s3_client = s3_client or boto3.client("s3")
+    def __init__(self, s3_client=None):
+        """
+        :param s3_client: S3 client to download plugins with. If not provided, one is created the first
+        time an S3 plugin is downloaded.
+        """
+        self._s3_client = s3_client
+
+    @property
+    def s3_client(self):
+        """Lazily create the S3 client so configs without S3 plugins never pay for it"""
+        if self._s3_client is None:
+            self._s3_client = boto3.client("s3")
+        return self._s3_client
 
     def download_plugins(self, plugin_paths: Dict[str, str]):
         """
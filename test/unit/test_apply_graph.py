@@ -1,5 +1,5 @@
 """Tests for Graph applyinhs"""
-from typing import List
+from typing import Dict, List
 from unittest import TestCase
 from unittest.mock import patch, MagicMock, call
 
@@ -19,12 +19,31 @@ class TestApplyGraph(TestCase):
         self.graph.add_nodes_from(["foo/app1", "bar/app1"])
         self.post_graph = ["bar/app2"]
 
+    @staticmethod
+    def _recording_entry_factory(executed: List[str]):
+        """Get a GraphEntry factory whose entries succeed and append their path to executed when run"""
+
+        # pylint: disable=unused-argument
+        def _get_graph_entry(path: str, variables: List[str], directory_listings: Dict):
+            entry = MagicMock()
+            entry.state = "Success"
+            entry.path = path
+
+            def _execute(*args, **kwargs):
+                executed.append(path)
+                return 0, [path], True
+
+            entry.execute.side_effect = _execute
+            return entry
+
+        return _get_graph_entry
+
     @patch("terrawrap.models.graph.GraphEntry")
     def test_execute(self, graph_entry_class):
         """Test that executing a graph"""
 
         # pylint: disable=unused-argument
-        def _get_graph_entry(path: str, variables: List[str]):
+        def _get_graph_entry(path: str, variables: List[str], directory_listings: Dict):
             entry = MagicMock()
             entry.state = "Success"
             entry.path = path
@@ -48,3 +67,82 @@ class TestApplyGraph(TestCase):
 
         self.assertEqual(graph.not_applied, {"foo/app1"})
         self.assertEqual(graph.applied, {"bar/app1", "bar/app2"})
+
+    @patch("terrawrap.models.graph.GraphEntry")
+    def test_execute_skips_successors_of_failures(self, graph_entry_class):
+        """Test that entries only run once all of their predecessors succeeded"""
+
+        # pylint: disable=unused-argument
+        def _get_graph_entry(path: str, variables: List[str], directory_listings: Dict):
+            entry = MagicMock()
+            entry.path = path
+            entry.state = "Pending"
+            failed = path == "bar/fail"
+
+            def _execute(*args, **kwargs):
+                entry.state = "Failed" if failed else "Success"
+                return 1 if failed else 0, [path], True
+
+            entry.execute.side_effect = _execute
+            return entry
+
+        graph_entry_class.side_effect = _get_graph_entry
+
+        self.graph.add_edge("bar/app1", "bar/app2")
+        self.graph.add_edge("bar/app2", "bar/app3")
+        self.graph.add_edge("bar/fail", "bar/app3")
+        self.graph.add_edge("bar/app1", "bar/app4")
+
+        graph = ApplyGraph("plan", self.graph, [], "bar")
+        graph.execute_graph()
+
+        self.assertEqual(graph.failures, ["bar/fail"])
+        graph.graph_dict["bar/app3"].execute.assert_not_called()
+        self.assertEqual(graph.not_applied, {"foo/app1", "bar/app3"})
+        self.assertEqual(
+            graph.applied, {"bar/app1", "bar/app2", "bar/app4", "bar/fail"}
+        )
+
+    @patch("terrawrap.models.graph.GraphEntry")
+    def test_execute_deep_graph(self, graph_entry_class):
+        """Test that every level of a deep graph is awaited and joins only run once"""
+        executed: List[str] = []
+        graph_entry_class.side_effect = self._recording_entry_factory(executed)
+
+        graph = networkx.DiGraph()
+        graph.add_edges_from(
+            [
+                ("bar/a", "bar/b"),
+                ("bar/b", "bar/c"),
+                ("bar/c", "bar/d"),
+                ("bar/a", "bar/e"),
+                ("bar/e", "bar/d"),
+            ]
+        )
+
+        apply_graph = ApplyGraph("plan", graph, [], "bar")
+        apply_graph.execute_graph(num_parallel=2)
+
+        self.assertEqual(
+            sorted(executed), ["bar/a", "bar/b", "bar/c", "bar/d", "bar/e"]
+        )
+        self.assertEqual(executed[0], "bar/a")
+        self.assertEqual(executed[-1], "bar/d")
+        self.assertEqual(
+            apply_graph.applied, {"bar/a", "bar/b", "bar/c", "bar/d", "bar/e"}
+        )
+
+    @patch("terrawrap.models.graph.GraphEntry")
+    def test_execute_runs_released_entries_first(self, graph_entry_class):
+        """Test that a chain is followed before moving on to other ready entries"""
+        executed: List[str] = []
+        graph_entry_class.side_effect = self._recording_entry_factory(executed)
+
+        graph = networkx.DiGraph()
+        graph.add_nodes_from(["bar/a", "bar/c"])
+        graph.add_edge("bar/a", "bar/b")
+
+        apply_graph = ApplyGraph("plan", graph, [], "bar")
+        apply_graph.execute_graph(num_parallel=1)
+
+        self.assertEqual(executed, ["bar/a", "bar/b", "bar/c"])
@@ -1,9 +1,18 @@
 """Test git utilities"""
 import os
+from concurrent.futures import Future
 from unittest import TestCase
-from unittest.mock import patch, ANY
+from unittest.mock import patch, ANY, call
 
-from terrawrap.utils.cli import execute_command, MAX_RETRIES, Status, _post_audit_info
+from terrawrap.utils.cli import (
+    execute_command,
+    MAX_RETRIES,
+    Status,
+    _get_audit_session,
+    _get_retriable_errors,
+    _log_audit_failure,
+    _post_audit_info,
+)
 
 
 class TestCli(TestCase):
@@ -14,6 +23,12 @@ class TestCli(TestCase):
         self.mock_popen = self.popen_patcher.start()
         self.mock_process = self.mock_popen.return_value
 
+        # Give the mocked process a real, empty pipe to read its output from
+        stdout_read, stdout_write = os.pipe()
+        os.close(stdout_write)
+        self.addCleanup(os.close, stdout_read)
+        self.mock_process.stdout.fileno.return_value = stdout_read
+
         self.jitter_patcher = patch("terrawrap.utils.cli.Jitter")
         self.mock_jitter = self.jitter_patcher.start()
         self.mock_jitter.return_value.backoff.return_value = 3
@@ -24,21 +39,41 @@ class TestCli(TestCase):
 
     def test_execute_command(self):
         """Test executing a command successfully"""
-        self.mock_process.poll.return_value = 0
+        self.mock_process.wait.return_value = 0
         exit_code, stdout = execute_command(["echo", "1 "])
 
         self.assertEqual(self.mock_popen.call_count, 1)
         self.assertEqual(exit_code, 0)
         self.assertEqual(stdout, [])
 
+    def test_execute_command_output(self):
+        """Test that output split across reads is returned as lines"""
+        self.mock_process.wait.return_value = 0
+
+        with patch("terrawrap.utils.cli.os.read") as mock_read:
+            mock_read.side_effect = [b"foo\nb\xc3", b"\xa9r\nbaz", b""]
+            exit_code, stdout = execute_command(["echo", "1"], print_output=False)
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(stdout, ["foo\n", "b\u00e9r\n", "baz"])
+
+    @patch("builtins.print")
+    def test_execute_command_prints_truncated(self, mock_print):
+        """Test that a character cut off at the end of the output is still printed"""
+        self.mock_process.wait.return_value = 0
+
+        with patch("terrawrap.utils.cli.os.read") as mock_read:
+            mock_read.side_effect = [b"foo\xc3", b""]
+            execute_command(["echo", "1"])
+
+        printed = "".join(print_call.args[0] for print_call in mock_print.mock_calls)
+        self.assertEqual(printed, "foo\ufffd")
+
     @patch("terrawrap.utils.cli._get_retriable_errors")
-    @patch("io.open")
-    def test_execute_command_retry(self, mock_open, mock_network_error):
+    def test_execute_command_retry(self, mock_network_error):
         """Test retrying execution because of network errors"""
-        self.mock_process.poll.side_effect = [1, 1, 1, 0]
+        self.mock_process.wait.side_effect = [1, 0]
         mock_network_error.side_effect = [["Throttling"], []]
-        mock_stdout_read = mock_open.return_value
-        mock_stdout_read.readline.return_value = b""
 
         exit_code, stdout = execute_command(["echo", "1"], retry=True)
 
@@ -47,10 +82,18 @@ class TestCli(TestCase):
         self.assertEqual(stdout, [])
 
     @patch("terrawrap.utils.cli._get_retriable_errors")
-    @patch("io.open")
-    def test_execute_command_max_retry(self, mock_open, mock_network_error):
+    def test_execute_command_success_not_scanned(self, mock_network_error):
+        """Test that output isn't searched for retriable errors when the command succeeds"""
+        self.mock_process.wait.return_value = 0
+
+        execute_command(["echo", "1"], retry=True)
+
+        mock_network_error.assert_not_called()
+
+    @patch("terrawrap.utils.cli._get_retriable_errors")
+    def test_execute_command_max_retry(self, mock_network_error):
         """Test retrying execution because of network errors up to 5 times"""
-        self.mock_process.poll.return_value = 255
+        self.mock_process.wait.return_value = 255
         mock_network_error.side_effect = [
             ["Throttling"],
             ["unexpected EOF"],
@@ -59,19 +102,68 @@ class TestCli(TestCase):
             ["Throttling"],
             ["unexpected EOF"],
         ]
-        mock_stdout_read = mock_open.return_value
-        mock_stdout_read.readline.return_value = b""
 
         exit_code, stdout = execute_command(["echo", "1"], retry=True)
 
         self.assertEqual(self.mock_popen.call_count, MAX_RETRIES)
+        # There's no backoff after the last attempt
+        self.assertEqual(
+            self.mock_jitter.return_value.backoff.call_count, MAX_RETRIES - 1
+        )
         self.assertEqual(exit_code, 255)
         self.assertEqual(stdout, [])
 
-    @patch("terrawrap.utils.cli.BotoAWSRequestsAuth")
-    @patch("requests.post")
-    def test_post_audit_info_statuses(self, mock_post, _):
+    @patch("terrawrap.utils.cli.AUDIT_EXECUTOR")
+    def test_execute_command_posts_audit_info(self, mock_audit_executor):
+        """Test that audit info is posted in the background before and after applying"""
+        self.mock_process.wait.return_value = 0
+
+        execute_command(
+            ["terraform", "apply"], audit_api_url="foo.bar", cwd="/fake/path"
+        )
+
+        self.assertEqual(
+            mock_audit_executor.submit.call_args_list,
+            [
+                call(
+                    _post_audit_info,
+                    audit_api_url="foo.bar",
+                    path="/fake/path",
+                    start_time=ANY,
+                ),
+                call(
+                    _post_audit_info,
+                    audit_api_url="foo.bar",
+                    path="/fake/path",
+                    exit_code=0,
+                    stdout=[],
+                    start_time=ANY,
+                    update=True,
+                ),
+            ],
+        )
+        mock_audit_executor.submit.return_value.add_done_callback.assert_called_with(
+            _log_audit_failure
+        )
+
+    @patch("terrawrap.utils.cli.logger")
+    def test_log_audit_failure(self, mock_logger):
+        """Test that an error from posting audit info in the background is logged"""
+        failed: Future = Future()
+        failed.set_exception(RuntimeError("no git repo"))
+        succeeded: Future = Future()
+        succeeded.set_result(None)
+
+        _log_audit_failure(succeeded)
+        mock_logger.error.assert_not_called()
+
+        _log_audit_failure(failed)
+        mock_logger.error.assert_called_once()
+
+    @patch("terrawrap.utils.cli._get_audit_session")
+    def test_post_audit_info_statuses(self, mock_get_audit_session):
         """Test Audit API helper function for each possible status"""
+        mock_post = mock_get_audit_session.return_value.post
         statuses = {Status.IN_PROGRESS: None, Status.FAILED: 2, Status.SUCCESS: 0}
 
         fake_url = "foo.bar"
@@ -87,7 +179,6 @@ class TestCli(TestCase):
 
             mock_post.assert_called_with(
                 url="foo.bar/audit_info",
-                auth=ANY,
                 json={
                     "directory": "/test/helpers/mock_directory/config/.tf_wrapper",
                     "start_time": 12345,
@@ -97,3 +188,26 @@ class TestCli(TestCase):
                 },
                 timeout=30,
             )
+
+    def test_get_retriable_errors(self):
+        """Test that only lines containing a retriable error are returned"""
+        out = [
+            "Error: RequestError: send request failed\n",
+            "Error: invalid value for name\n",
+            "Error: Throttling: Rate exceeded\n",
+            "Please try again (maybe)\n",
+        ]
+
+        self.assertEqual(_get_retriable_errors(out), [out[0], out[2]])
+
+    @patch("terrawrap.utils.cli.BotoAWSRequestsAuth")
+    def test_audit_session_reused(self, mock_auth):
+        """Test that the audit API session and its auth are only created once"""
+        _get_audit_session.cache_clear()
+
+        session = _get_audit_session()
+
+        self.assertIs(session, _get_audit_session())
+        self.assertEqual(session.auth, mock_auth.return_value)
+        mock_auth.assert_called_once()
+        _get_audit_session.cache_clear()
@@ -0,0 +1,30 @@
+"""Tests for collection utilities"""
+from unittest import TestCase
+
+from terrawrap.utils.collection_utils import update
+
+
+class TestCollectionUtils(TestCase):
+    """Tests for collection utilities"""
+
+    def test_update(self):
+        """Test nested dictionaries and lists are merged and other values are replaced"""
+        dict1 = {"a": 1, "b": {"c": [1], "d": {"e": 2}}, "f": "keep"}
+        dict2 = {"a": 3, "b": {"c": [2], "d": {"g": 4}}, "h": {"i": [5]}, "j": {}}
+
+        merged = update(dict1, dict2)
+
+        self.assertIs(merged, dict1)
+        self.assertEqual(
+            merged,
+            {
+                "a": 3,
+                "b": {"c": [1, 2], "d": {"e": 2, "g": 4}},
+                "f": "keep",
+                "h": {"i": [5]},
+                "j": {},
+            },
+        )
+        # New children are copies, so later merges don't change the source dictionary
+        self.assertIsNot(merged["h"], dict2["h"])
+        self.assertIsNot(merged["h"]["i"], dict2["h"]["i"])
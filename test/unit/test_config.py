@@ -1,5 +1,6 @@
 """Test terraform config utilities"""
 import os
+import tempfile
 from unittest import TestCase
 
 from unittest.mock import patch, MagicMock
@@ -14,7 +15,10 @@ from terrawrap.models.wrapper_config import (
 from terrawrap.utils.config import (
     calc_backend_config,
     parse_wrapper_configs,
+    parse_wrapper_configs_cached,
+    find_variable_files,
     find_wrapper_config_files,
+    register_ssm_envvars,
     resolve_envvars,
     graph_wrapper_dependencies,
     walk_and_graph_directory,
@@ -238,6 +242,20 @@ class TestConfig(TestCase):
 
         self.assertEqual(expected_config_files, actual_config_files)
 
+    def test_find_variable_files_sees_new_files(self):
+        """Test that directory listings are only reused when the caller shares them"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            directory_listings: dict = {}
+            self.assertEqual(find_variable_files(temp_dir), [])
+            self.assertEqual(find_variable_files(temp_dir, directory_listings), [])
+
+            variable_file = os.path.join(temp_dir, "generated.auto.tfvars")
+            with open(variable_file, "w", encoding="utf-8"):
+                pass
+
+            self.assertEqual(find_variable_files(temp_dir), [variable_file])
+            self.assertEqual(find_variable_files(temp_dir, directory_listings), [])
+
     def test_parse_wrapper_config(self):
         """Test parse wrapper configs and merge correctly"""
         wrapper_config = parse_wrapper_configs(
@@ -255,6 +273,21 @@ class TestConfig(TestCase):
         )
         self.assertEqual("FAKE_SSM_PATH", wrapper_config.envvars["SSM_KEY"].path)
 
+    def test_parse_wrapper_config_cached(self):
+        """Test parsed wrapper configs are reused for the same files"""
+        wrapper_config_files = (
+            os.path.join(os.getcwd(), "mock_directory/config/.tf_wrapper"),
+            os.path.join(os.getcwd(), "mock_directory/config/app4/.tf_wrapper"),
+        )
+        wrapper_config = parse_wrapper_configs_cached(wrapper_config_files)
+
+        self.assertIs(
+            wrapper_config, parse_wrapper_configs_cached(wrapper_config_files)
+        )
+        self.assertEqual(
+            "OVERWRITTEN_VALUE", wrapper_config.envvars["OVERWRITTEN_KEY"].value
+        )
+
     @patch("terrawrap.utils.config.SSM_ENVVAR_CACHE")
     def test_resolve_envvars_from_wrapper_config(self, mock_ssm_cache):
         """Test envvars can be resolved correctly"""
@@ -274,3 +307,17 @@ class TestConfig(TestCase):
         self.assertEqual("10", actual_envvars["NOT_A_STRING"])
         self.assertEqual(None, actual_envvars["FORCE_UNSET"])
         mock_ssm_cache.parameter.assert_called_once_with("FAKE_SSM_PATH")
+
+    @patch("terrawrap.utils.config.SSM_ENVVAR_CACHE")
+    def test_register_ssm_envvars(self, mock_ssm_cache):
+        """Test only SSM envvars are added to the SSM cache"""
+        wrapper_config = parse_wrapper_configs(
+            wrapper_config_files=[
+                os.path.join(os.getcwd(), "mock_directory/config/.tf_wrapper"),
+                os.path.join(os.getcwd(), "mock_directory/config/app4/.tf_wrapper"),
+            ]
+        )
+
+        register_ssm_envvars(wrapper_config.envvars)
+
+        mock_ssm_cache.parameter.assert_called_once_with("FAKE_SSM_PATH")
@@ -4,7 +4,7 @@ from collections import namedtuple
 from unittest import TestCase
 from unittest.mock import patch
 
-from terrawrap.utils.git_utils import get_git_changed_files
+from terrawrap.utils.git_utils import get_git_changed_files, get_git_root
 
 Change = namedtuple("Change", ["a_path", "b_path", "new_file", "deleted_file"])
 
@@ -23,3 +23,15 @@ class TestGit(TestCase):
         actual = get_git_changed_files(os.getcwd())
 
         self.assertEqual(actual, {"/bar", "/foo", "/baz"})
+
+    @patch("terrawrap.utils.git_utils._get_repo")
+    def test_get_git_root_cached(self, get_repo):
+        """Test the git root is only looked up once per path"""
+        get_git_root.cache_clear()
+        get_repo.return_value.git.rev_parse.return_value = "/repo"
+
+        self.assertEqual(get_git_root("/repo/foo"), "/repo")
+        self.assertEqual(get_git_root("/repo/foo"), "/repo")
+
+        get_repo.return_value.git.rev_parse.assert_called_once_with("--show-toplevel")
+        get_git_root.cache_clear()
@@ -66,3 +66,18 @@ class TestGraphEntry(TestCase):
             stdout, ["Success", "\n", "Resources: 0 added, 0 changed, 0 destroyed"]
         )
         self.assertEqual(changes_detected, False)
+
+    @patch("terrawrap.models.graph_entry.execute_command")
+    def test_execute_auto_approve(self, exec_command):
+        """Test that apply and destroy are run as an argument list ending in -auto-approve"""
+        for operation in ["apply", "destroy"]:
+            exec_command.reset_mock()
+            exec_command.side_effect = [(0, ["Success"]), (0, ["Success"])]
+
+            entry = GraphEntry("/var", [])
+            entry.execute(operation)
+
+            operation_call = exec_command.call_args
+            self.assertIsInstance(operation_call.args[0], list)
+            self.assertEqual(operation_call.args[0][-2:], [operation, "-auto-approve"])
+            self.assertNotIn("shell", operation_call.kwargs)
@@ -3,6 +3,7 @@ from unittest import TestCase
 from unittest.mock import patch, call
 
 import os
+import tempfile
 
 from terrawrap.models.pipeline import Pipeline
 
@@ -32,3 +33,51 @@ class TestPipeline(TestCase):
             pipeline_entry_class.return_value.execute.mock_calls,
             [call("plan", debug=False)],
         )
+
+    @patch("terrawrap.models.pipeline.PipelineEntry")
+    def test_short_row(self, pipeline_entry_class):
+        """Test that a row without a variables field is read as having no variables"""
+        Pipeline("plan", "pipelines/short_row.csv")
+
+        pipeline_entry_class.assert_called_once_with(
+            path="config/app1", variables=[], directory_listings={}
+        )
+
+    @patch("terrawrap.models.pipeline.PipelineEntry")
+    def test_truncated_row(self, pipeline_entry_class):
+        """Test that a row without a directory is an error instead of running in the current directory"""
+        with self.assertRaises(RuntimeError):
+            Pipeline("apply", "pipelines/truncated_row.csv")
+
+        pipeline_entry_class.assert_not_called()
+
+    @patch("terrawrap.models.pipeline.PipelineEntry")
+    def test_empty_file(self, pipeline_entry_class):
+        """Test that an empty pipeline file is an empty pipeline"""
+        pipeline = Pipeline("plan", "pipelines/empty.csv")
+
+        self.assertEqual(pipeline.entries, {})
+        pipeline_entry_class.assert_not_called()
+
+    @patch("terrawrap.models.pipeline.PipelineEntry")
+    def test_symlinks_run_sequentially(self, pipeline_entry_class):
+        """Test that symlinked directories are run sequentially, with or without a trailing slash"""
+        pipeline_entry_class.side_effect = (
+            lambda path, variables, directory_listings: path
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            os.chdir(temp_dir)
+            os.mkdir("real")
+            os.symlink("real", "link")
+            with open("pipeline.csv", "w", encoding="utf-8") as pipeline_file:
+                pipeline_file.write(
+                    "seq,directory,variables\n1,link,\n1,link/,\n1,real/,\n"
+                )
+
+            pipeline = Pipeline("plan", "pipeline.csv")
+
+        self.assertEqual(
+            pipeline.entries[1],
+            {"sequential": ["link", "link/"], "parallel": ["real/"]},
+        )
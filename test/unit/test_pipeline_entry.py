@@ -67,3 +67,43 @@ class TestPipelineEntry(TestCase):
         self.assertEqual(exit_code, 0)
         self.assertEqual(stdout, ["Success", "\n", "Nothing changed"])
         self.assertEqual(changes_detected, False)
+
+    @patch("terrawrap.models.pipeline_entry.resolve_envvars")
+    @patch("terrawrap.models.pipeline_entry.execute_command")
+    def test_envvars_resolved_on_execute(self, exec_command, resolve_envvars):
+        """Test that envvars are only resolved once the entry is executed"""
+        exec_command.side_effect = [(0, ["Success"]), (0, ["Success"])]
+        resolve_envvars.return_value = {"FOO": "bar"}
+
+        entry = PipelineEntry("/var", [])
+        resolve_envvars.assert_not_called()
+
+        entry.execute("plan")
+
+        resolve_envvars.assert_called_once()
+        self.assertEqual(exec_command.call_args.kwargs["env"]["FOO"], "bar")
+
+    @patch("terrawrap.models.pipeline_entry.tempfile.mkstemp")
+    @patch("terrawrap.models.pipeline_entry.execute_command")
+    def test_execute_plan_without_plan_file(self, exec_command, mkstemp):
+        """Test that a plan file is only created for apply"""
+        exec_command.side_effect = [(0, ["Success"]), (0, ["Success"])]
+
+        entry = PipelineEntry("/var", [])
+        entry.execute("plan")
+
+        mkstemp.assert_not_called()
+
+    @patch("terrawrap.models.pipeline_entry.resolve_envvars")
+    @patch("terrawrap.models.pipeline_entry.execute_command")
+    def test_execute_envvars_fail(self, exec_command, resolve_envvars):
+        """Test that failing to resolve envvars fails the entry instead of raising"""
+        resolve_envvars.side_effect = RuntimeError("SSM is down")
+
+        entry = PipelineEntry("/var", [])
+        exit_code, stdout, changes_detected = entry.execute("plan")
+
+        self.assertEqual(exit_code, 1)
+        self.assertIn("SSM is down", stdout[0])
+        self.assertEqual(changes_detected, True)
+        exec_command.assert_not_called()
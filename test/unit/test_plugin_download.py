@@ -142,3 +142,14 @@ class TestPluginDownload(TestCase):
         self.plugin_download._download_file("s3://test/bar", "/tmp/plugins/foo")
 
         open_mock.return_value.write.assert_has_calls([])
+
+    @patch("terrawrap.utils.plugin_download.boto3")
+    def test_s3_client_created_lazily(self, mock_boto3):
+        """Test that no S3 client is created until an S3 plugin is downloaded"""
+        plugin_download = PluginDownload()
+
+        mock_boto3.client.assert_not_called()
+
+        self.assertEqual(plugin_download.s3_client, mock_boto3.client.return_value)
+        self.assertEqual(plugin_download.s3_client, mock_boto3.client.return_value)
+        mock_boto3.client.assert_called_once_with("s3")